@@ -11,6 +11,9 @@ Only supports the *final* normalized schema (no legacy compatibility):
 - normal: unified [[sections]]; section items contain only {content, author?}
 - multi-project: [[courses]] with [[courses.sections]]; teacher list in [[courses.teachers]]
 
+TOML is parsed with pytomlpp when it is installed, otherwise with the stdlib
+tomllib; the rendered output is the same either way.
+
 Badges (shields.io) are preserved:
 - Optional grading badges from grades_summary.toml (best-effort)
 - Basic info badges parsed from a "基本信息" section; that section is removed from
@@ -19,13 +22,31 @@ Badges (shields.io) are preserved:
 CLI
 - --input FILE|DIR: convert one file or scan DIR/**/readme.toml
 - --all: convert ./final/**/readme.toml
+- --overwrite / --force: re-render existing READMEs
+- --if-stale: re-render existing READMEs only when older than their sources
+- --jobs N: parallel workers for multi-file runs (threads with pytomlpp,
+    processes otherwise)
+- --no-cache: do not use the parsed-TOML disk cache
+    ($XDG_CACHE_HOME/repos-management/toml, default ~/.cache/...)
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import io
+import os
+import pickle
 import re
-import textwrap
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, repeat
 from pathlib import Path
 from typing import Any
 
@@ -34,31 +55,70 @@ try:  # Python 3.11+
 except ModuleNotFoundError:  # pragma: no cover (Python <= 3.10)
     import tomli as tomllib  # type: ignore
 
+try:  # Optional C++ parser, noticeably faster on large --all runs
+    import pytomlpp as _fast_toml
+except ModuleNotFoundError:
+    _fast_toml = None
+
+# Both take a binary file object: tomllib decodes the bytes itself, so we skip the
+# text-mode read (and its newline translation) on our side.
+_toml_load = _fast_toml.load if _fast_toml is not None else tomllib.load
+
+
+_LABEL_TAIL_RE = re.compile(r"^(?P<label>.*?)(?P<sep>\s*)(?P<tail>\d+(?:\.\d+)?%?)$", re.DOTALL)
+_KV_LINE_RE = re.compile(r"^\s*【(?P<k>[^】]+)】\s*[:：]\s*(?P<v>.*\S)\s*$")
+_GRADE_SPLIT_RE = re.compile(r"\s*\|\s*|(?<=[0-9%])\s*\+\s*")
+
 
 def _s(v: Any) -> str:
+    if type(v) is str:
+        return v
     if v is None:
         return ""
-    if isinstance(v, str):
-        return v
     return str(v)
 
 
-def _as_list(v: Any) -> list:
-    if v is None:
-        return []
-    return v if isinstance(v, list) else [v]
+def _iter_dicts(v: Any) -> Iterator[dict]:
+    # A lone table counts as a one-element array; anything else yields nothing.
+    if type(v) is list:
+        for x in v:
+            if type(x) is dict:
+                yield x
+    elif type(v) is dict:
+        yield v
+
+
+def _normalize_newlines(text: str) -> str:
+    # Most TOML content has no '\r' at all; the membership test is a single C scan.
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
 def _norm_block(text: Any) -> str:
-    return _s(text).replace("\r\n", "\n").replace("\r", "\n").strip()
+    return _normalize_newlines(_s(text)).strip()
 
 
 def _normalize_multiline_md(text: Any) -> str:
-    s = _s(text).replace("\r\n", "\n").replace("\r", "\n")
-    s = textwrap.dedent(s)
-    return s.strip()
+    """Normalize newlines, dedent and strip (same result as textwrap.dedent(...).strip())."""
+
+    lines = _normalize_newlines(_s(text)).split("\n")
+    margin: str | None = None
+    for ln in lines:
+        body = ln.lstrip(" \t")
+        if not body:
+            continue
+        indent = ln[: len(ln) - len(body)]
+        margin = indent if margin is None else os.path.commonprefix((margin, indent))
+
+    cut = len(margin or "")
+    return "\n".join(ln[cut:] if ln.lstrip(" \t") else "" for ln in lines).strip()
+
+
+_SHIELDS_BADGE_BASE = "https://img.shields.io/badge/"
 
 
+@functools.lru_cache(maxsize=1024)
 def _encode_shields_component(text: str) -> str:
     """Encode a single shields.io path component.
 
@@ -76,7 +136,11 @@ def _encode_shields_component(text: str) -> str:
 
 
 def _render_shields_badge(*, alt: str, label: str, message: str | None = None, color: str | None = None) -> str:
-    base = "https://img.shields.io/badge/"
+    return _render_shields_badge_cached(alt, label, message, color)
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_shields_badge_cached(alt: str, label: str, message: str | None, color: str | None) -> str:
     if message is None and color is not None:
         path = f"{_encode_shields_component(label)}-{_encode_shields_component(color)}"
     else:
@@ -87,7 +151,7 @@ def _render_shields_badge(*, alt: str, label: str, message: str | None = None, c
             f"{_encode_shields_component(msg)}-"
             f"{_encode_shields_component(col)}"
         )
-    return f"![{alt}]({base}{path})"
+    return f"![{alt}]({_SHIELDS_BADGE_BASE}{path})"
 
 
 def _split_label_value_tail(text: str) -> tuple[str, str]:
@@ -96,34 +160,120 @@ def _split_label_value_tail(text: str) -> tuple[str, str]:
     s = _s(text).strip()
     if not s:
         return ("", "")
-    parts = s.split()
-    if len(parts) >= 2:
-        tail = parts[-1].strip()
-        if re.fullmatch(r"\d+(?:\.\d+)?%?", tail):
-            label = "".join(parts[:-1]).strip()
-            return (label or s, tail)
-
-    m = re.match(r"^(?P<label>.*?)(?P<tail>\d+(?:\.\d+)?%?)$", s)
-    if m:
-        label = _s(m.group("label")).strip()
-        tail = _s(m.group("tail")).strip()
-        return (label or s, tail)
+    m = _LABEL_TAIL_RE.match(s)
+    # A multi-line label only splits off a whitespace-separated tail.
+    if not m or (not m.group("sep") and "\n" in m.group("label")):
+        return (s, "")
+    # A whitespace-separated tail glues the label words together: '课堂 实验 30%' -> '课堂实验'.
+    label = "".join(m.group("label").split()) if m.group("sep") else m.group("label").strip()
+    # Labels come from a small recurring set (作业, 期末考试, 理论学时, ...); interning
+    # them lets the badge caches match on identity instead of comparing contents.
+    return (sys.intern(label or s), m.group("tail"))
 
-    return (s, "")
 
+# Markdown heading prefixes, written piecewise so headers need no f-string temporaries.
+_H1, _H2, _H3 = "# ", "## ", "### "
 
 _GRADES_SUMMARY_CACHE: dict[Path, dict] = {}
+_GRADES_SUMMARY_LOCK = threading.Lock()
+# Summaries returned by _load_grades_summary, by id(), so grade lookups can be
+# memoized on (id, course_code) without hashing the dict itself.
+_GRADES_SUMMARY_BY_ID: dict[int, dict] = {}
+
+# Parsed TOML documents are pickled here, keyed by (path, mtime_ns, size).
+# Set to None (via --no-cache) to always parse from source. This lives in the
+# user's cache dir, never the working tree: unpickling a planted file runs code.
+_TOML_CACHE_DIR: Path | None = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "repos-management" / "toml"
+)
+# Entries not rewritten for this long are pruned at the end of a run.
+_TOML_CACHE_MAX_AGE = 30 * 24 * 3600
+_TEMP_ROOT = Path(tempfile.gettempdir()).resolve()
+
+
+def _cached_toml_load(path: Path) -> dict:
+    path = path.resolve()
+    # Throwaway inputs (e.g. rdme_autogen's tempdir) would only leave dead entries.
+    if _TOML_CACHE_DIR is None or path.is_relative_to(_TEMP_ROOT):
+        with path.open("rb") as f:
+            return _toml_load(f)
+
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    cache_file = _TOML_CACHE_DIR / f"{hashlib.sha1(str(path).encode('utf-8')).hexdigest()}.pkl"
+    try:
+        with cache_file.open("rb") as f:
+            cached_key, cached_data = pickle.load(f)
+        if cached_key == key:
+            return cached_data
+    except Exception:
+        # Missing, truncated or foreign entries are all just a miss.
+        pass
+
+    with path.open("rb") as f:
+        data = _toml_load(f)
+    # Storing is best-effort: an unwritable cache dir must not fail the conversion.
+    # Parallel workers may store the same entry; publish it atomically.
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with tmp_file.open("wb") as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            tmp_file.unlink(missing_ok=True)
+        except OSError:
+            pass
+    return data
+
+
+def _prune_toml_cache() -> None:
+    if _TOML_CACHE_DIR is None:
+        return
+    cutoff = time.time() - _TOML_CACHE_MAX_AGE
+    try:
+        with os.scandir(_TOML_CACHE_DIR) as it:
+            for e in it:
+                try:
+                    if e.is_file(follow_symlinks=False) and e.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(e.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+_FIND_UPWARDS_CACHE: dict[tuple[Path, str], Path | None] = {}
 
 
 def _find_upwards(start: Path, filename: str) -> Path | None:
+    key = (start, filename)
+    if key in _FIND_UPWARDS_CACHE:
+        return _FIND_UPWARDS_CACHE[key]
+
     cur = start.resolve()
     if cur.is_file():
         cur = cur.parent
-    for p in [cur, *cur.parents]:
-        cand = p / filename
-        if cand.exists() and cand.is_file():
-            return cand
-    return None
+    found: Path | None = None
+    while True:
+        cand = cur / filename
+        try:
+            if stat.S_ISREG(os.stat(cand).st_mode):
+                found = cand
+                break
+        except OSError:
+            pass
+        if cur.parent == cur:
+            break
+        cur = cur.parent
+
+    _FIND_UPWARDS_CACHE[key] = found
+    return found
+
+
+def _grades_summary_path(toml_path: Path) -> Path | None:
+    return _find_upwards(Path.cwd(), "grades_summary.toml") or _find_upwards(toml_path, "grades_summary.toml")
 
 
 def _load_grades_summary(toml_path: Path) -> dict:
@@ -134,23 +284,37 @@ def _load_grades_summary(toml_path: Path) -> dict:
     - from the input toml path upwards (for local runs)
     """
 
-    path = _find_upwards(Path.cwd(), "grades_summary.toml") or _find_upwards(toml_path, "grades_summary.toml")
+    path = _grades_summary_path(toml_path)
     if not path:
         return {}
-    cached = _GRADES_SUMMARY_CACHE.get(path)
-    if cached is not None:
-        return cached
-    try:
-        data = tomllib.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        data = {}
-    if not isinstance(data, dict):
-        data = {}
-    _GRADES_SUMMARY_CACHE[path] = data
-    return data
+    with _GRADES_SUMMARY_LOCK:
+        cached = _GRADES_SUMMARY_CACHE.get(path)
+        if cached is not None:
+            return cached
+        try:
+            data = _cached_toml_load(path)
+        except Exception:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        _GRADES_SUMMARY_CACHE[path] = data
+        _GRADES_SUMMARY_BY_ID[id(data)] = data
+        return data
 
 
 def _pick_grade_string(grades_summary: dict, course_code: str) -> str:
+    summary_id = id(grades_summary)
+    if _GRADES_SUMMARY_BY_ID.get(summary_id) is grades_summary:
+        return _pick_grade_string_cached(summary_id, course_code)
+    return _find_grade_string(grades_summary, course_code)
+
+
+@functools.lru_cache(maxsize=None)
+def _pick_grade_string_cached(summary_id: int, course_code: str) -> str:
+    return _find_grade_string(_GRADES_SUMMARY_BY_ID[summary_id], course_code)
+
+
+def _find_grade_string(grades_summary: dict, course_code: str) -> str:
     grades = grades_summary.get("grades") if isinstance(grades_summary, dict) else None
     if not isinstance(grades, dict):
         return ""
@@ -175,13 +339,16 @@ def _pick_grade_string(grades_summary: dict, course_code: str) -> str:
         if isinstance(cand, dict) and _s(cand.get("grade")).strip():
             return _s(cand.get("grade")).strip()
 
+    # Keys are sorted at every level: table order differs between parsers
+    # (tomllib keeps declaration order), and the pick must not depend on that.
+    # Results are memoized per (summary, course), so the sorts are cheap.
     def dfs(node: Any) -> str:
         if isinstance(node, dict):
             g = _s(node.get("grade")).strip()
             if g:
                 return g
-            for k in sorted([x for x in node.keys() if isinstance(x, str)]):
-                out = dfs(node.get(k))
+            for k in sorted(x for x in node if type(x) is str):
+                out = dfs(node[k])
                 if out:
                     return out
         return ""
@@ -194,7 +361,7 @@ def _render_grading_badges_from_grade_string(grade: str) -> list[str]:
     if not grade:
         return []
 
-    parts = [p.strip() for p in re.split(r"\s*\|\s*|(?<=[0-9%])\s*\+\s*", grade) if p.strip()]
+    parts = [p.strip() for p in _GRADE_SPLIT_RE.split(grade) if p.strip()]
     if not parts:
         return []
 
@@ -215,7 +382,7 @@ def _render_basic_info_badges(content: str, *, fallback_grading_badges: list[str
 
     kv: dict[str, str] = {}
     for ln in text.split("\n"):
-        m = re.match(r"^\s*【(?P<k>[^】]+)】\s*[:：]\s*(?P<v>.*\S)\s*$", ln)
+        m = _KV_LINE_RE.match(ln)
         if not m:
             continue
         kv[m.group("k").strip()] = m.group("v").strip()
@@ -256,25 +423,40 @@ def _render_basic_info_badges(content: str, *, fallback_grading_badges: list[str
     return badges
 
 
-def _iter_authors(author: Any) -> list[dict]:
+def _iter_authors(author: Any) -> Iterator[dict]:
     if author is None:
-        return []
+        return
     if isinstance(author, str):
         name = author.strip()
-        return [{"name": name, "link": "", "date": ""}] if name else []
-    if isinstance(author, dict):
-        return [author]
-    if isinstance(author, list):
-        return [a for a in author if isinstance(a, dict)]
-    return []
+        if name:
+            yield {"name": name, "link": "", "date": ""}
+    elif isinstance(author, dict):
+        yield author
+    elif isinstance(author, list):
+        yield from (a for a in author if isinstance(a, dict))
 
 
 def _render_author(author: Any, *, indent: str = "") -> str:
+    # Fast path: most items have no author or a bare name string.
+    if author is None:
+        return ""
+    if type(author) is str:
+        name = author.strip()
+        return f"{indent}> 文 / {name}" if name else ""
+
+    key = tuple(
+        (_s(a.get("name")).strip(), _s(a.get("link")).strip(), _s(a.get("date")).strip())
+        for a in _iter_authors(author)
+    )
+    return _render_author_cached(key, indent)
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_author_cached(key: tuple[tuple[str, str, str], ...], indent: str) -> str:
+    """Render frozen (name, link, date) author entries; reviewers repeat across items."""
+
     parts: list[str] = []
-    for a in _iter_authors(author):
-        name = _s(a.get("name")).strip()
-        link = _s(a.get("link")).strip()
-        date = _s(a.get("date")).strip()
+    for name, link, date in key:
         if not name and not link and not date:
             continue
         disp = f"[{name}]({link})" if (name and link) else (name or link)
@@ -303,118 +485,89 @@ def _listify_md_lines(lines: list[str], *, indent: str) -> list[str]:
     return out
 
 
-def _render_lecturers(lecturers: Any) -> list[str]:
-    lec_list = [x for x in _as_list(lecturers) if isinstance(x, dict)]
-    if not lec_list:
-        return []
+def _write_lines(buf: io.StringIO, lines: Iterable[str]) -> None:
+    for ln in lines:
+        buf.write(ln)
+        buf.write("\n")
 
-    lines: list[str] = ["## 授课教师", ""]
-    for lec in lec_list:
-        name = _s(lec.get("name")).strip()
-        if not name:
-            continue
-        lines.append(f"- {name}")
 
-        reviews = [x for x in _as_list(lec.get("reviews")) if isinstance(x, dict)]
-        for rv in reviews:
-            content = _norm_block(rv.get("content"))
-            author = rv.get("author")
-            if not content and not author:
-                continue
+def _emit_reviews(buf: io.StringIO, reviews: Any, *, listify: bool) -> None:
+    """Write the reviews under a teacher/lecturer bullet.
 
-            content_lines = content.split("\n") if content else []
-            bullet_lines = _listify_md_lines(content_lines, indent="  ")
-            if bullet_lines:
-                lines.extend(bullet_lines)
-            else:
-                lines.append("  -")
+    With listify, every content line becomes its own nested bullet (lecturers);
+    otherwise the first line is the bullet and the rest are continuation lines,
+    with a blank line before the author quote (multi-project teachers).
+    """
 
-            aq = _render_author(author, indent="    ")
-            if aq:
-                lines.append(aq)
+    for rv in _render_section_items(reviews):
+        content_lines = rv["content_lines"]
+        author = rv["author"]
+        if not content_lines and not author:
+            continue
 
-    return lines
+        if listify:
+            bullet_lines = _listify_md_lines(content_lines, indent="  ")
+            _write_lines(buf, bullet_lines)
+            if not bullet_lines:
+                buf.write("  -\n")
+        elif content_lines:
+            first = content_lines[0].strip()
+            buf.write(f"  - {first}\n" if first else "  -\n")
+            for ln in content_lines[1:]:
+                if not ln or ln.isspace():
+                    continue
+                buf.write("    ")
+                buf.write(ln)
+                buf.write("\n")
+        else:
+            buf.write("  -\n")
 
+        aq = _render_author(author, indent="    ")
+        if aq:
+            if not listify:
+                buf.write("\n")
+            buf.write(aq)
+            buf.write("\n")
 
-def _render_teachers_with_reviews(teachers: Any) -> list[str]:
-    t_list = [x for x in _as_list(teachers) if isinstance(x, dict)]
-    if not t_list:
-        return []
 
-    lines: list[str] = []
-    for t in t_list:
-        name = _s(t.get("name")).strip()
+def _render_lecturers(lecturers: Any) -> str:
+    lec_iter = _iter_dicts(lecturers)
+    first = next(lec_iter, None)
+    if first is None:
+        return ""
+
+    buf = io.StringIO()
+    buf.write("## 授课教师\n\n")
+    for lec in chain((first,), lec_iter):
+        name = _s(lec.get("name")).strip()
         if not name:
             continue
-        lines.append(f"- {name}")
+        buf.write(f"- {name}\n")
+        _emit_reviews(buf, lec.get("reviews"), listify=True)
 
-        reviews = [x for x in _as_list(t.get("reviews")) if isinstance(x, dict)]
-        for rv in reviews:
-            content = _norm_block(rv.get("content"))
-            author = rv.get("author")
-            if not content and not author:
-                continue
+    return buf.getvalue()
 
-            content_lines = content.split("\n") if content else []
-            bullet_lines = _listify_md_lines(content_lines, indent="  ")
-            if bullet_lines:
-                lines.extend(bullet_lines)
-            else:
-                lines.append("  -")
-
-            aq = _render_author(author, indent="    ")
-            if aq:
-                lines.append(aq)
 
-    return lines
-
-
-def _render_teachers_with_reviews(teachers: Any) -> list[str]:
-    t_list = [x for x in _as_list(teachers) if isinstance(x, dict)]
-    if not t_list:
-        return []
-
-    lines: list[str] = []
-    for t in t_list:
+def _render_teachers_with_reviews(teachers: Any) -> str:
+    buf = io.StringIO()
+    for t in _iter_dicts(teachers):
         name = _s(t.get("name")).strip()
         if not name:
             continue
-        lines.append(f"- {name}")
+        buf.write(f"- {name}\n")
+        _emit_reviews(buf, t.get("reviews"), listify=False)
 
-        reviews = [x for x in _as_list(t.get("reviews")) if isinstance(x, dict)]
-        for rv in reviews:
-            content = _norm_block(rv.get("content"))
-            author = rv.get("author")
-            if not content and not author:
-                continue
-
-            content_lines = content.split("\n") if content else []
-            if content_lines:
-                first = content_lines[0].strip()
-                lines.append(f"  - {first}" if first else "  -")
-                for ln in content_lines[1:]:
-                    if ln.strip() == "":
-                        continue
-                    lines.append("    " + ln)
-            else:
-                lines.append("  -")
-
-            aq = _render_author(author, indent="    ")
-            if aq:
-                lines.append("")
-                lines.append(aq)
-
-    return lines
+    return buf.getvalue()
 
 
 def _render_section_items(items: Any) -> list[dict]:
     out: list[dict] = []
-    for it in _as_list(items):
-        if not isinstance(it, dict):
-            continue
+    for it in _iter_dicts(items):
+        content = _norm_block(it.get("content"))
         out.append(
             {
-                "content": _norm_block(it.get("content")),
+                "content": content,
+                "content_lines": content.split("\n") if content else [],
                 "author": it.get("author"),
             }
         )
@@ -422,7 +575,7 @@ def _render_section_items(items: Any) -> list[dict]:
 
 
 def _extract_basic_info_from_sections(
-    sections: list[dict], *, fallback_grading_badges: list[str]
+    sections: Iterable[dict], *, fallback_grading_badges: list[str]
 ) -> tuple[list[str], list[dict]]:
     """Extract badges from a '基本信息' section and remove it from sections."""
 
@@ -433,9 +586,8 @@ def _extract_basic_info_from_sections(
         if title == "基本信息":
             items = _render_section_items(sec.get("items"))
             for it in items:
-                c = _norm_block(it.get("content"))
-                if c:
-                    contents.append(c)
+                if it["content"]:
+                    contents.append(it["content"])
             continue
         kept.append(sec)
 
@@ -450,13 +602,17 @@ def _render_sections_schema(data: dict, *, grades_summary: dict | None = None) -
     course_code = _s(data.get("course_code")).strip()
     description = _norm_block(data.get("description"))
 
-    lines: list[str] = []
+    buf = io.StringIO()
+    buf.write(_H1)
     if course_code and course_name:
-        lines.append(f"# {course_code} - {course_name}")
+        buf.write(course_code)
+        buf.write(" - ")
+        buf.write(course_name)
     else:
-        lines.append(f"# {course_name or course_code or '课程'}")
+        buf.write(course_name or course_code or "课程")
+    buf.write("\n")
 
-    sections = [x for x in _as_list(data.get("sections")) if isinstance(x, dict)]
+    sections = _iter_dicts(data.get("sections"))
 
     fallback_grading_badges: list[str] = []
     if grades_summary and course_code:
@@ -467,37 +623,42 @@ def _render_sections_schema(data: dict, *, grades_summary: dict | None = None) -
         sections, fallback_grading_badges=fallback_grading_badges
     )
     if basic_badges:
-        lines.append("")
-        lines.extend(basic_badges)
+        buf.write("\n")
+        _write_lines(buf, basic_badges)
 
     if description:
-        lines.append("")
-        lines.append(description)
-
-    lec_lines = _render_lecturers(data.get("lecturers"))
-    if lec_lines:
-        lines.append("")
-        lines.extend(lec_lines)
+        buf.write("\n")
+        buf.write(description)
+        buf.write("\n")
+
+    lec_text = _render_lecturers(data.get("lecturers"))
+    if lec_text:
+        buf.write("\n")
+        buf.write(lec_text)
     for sec in sections:
         title = _s(sec.get("title")).strip() or "章节"
         items = _render_section_items(sec.get("items"))
         if not items:
             continue
 
-        lines.append("")
-        lines.append(f"## {title}")
+        buf.write("\n")
+        buf.write(_H2)
+        buf.write(title)
+        buf.write("\n")
         for it in items:
             content = it["content"]
             author = it["author"]
             if content:
-                lines.append("")
-                lines.append(content)
+                buf.write("\n")
+                buf.write(content)
+                buf.write("\n")
             aq = _render_author(author)
             if aq:
-                lines.append("")
-                lines.append(aq)
+                buf.write("\n")
+                buf.write(aq)
+                buf.write("\n")
 
-    return "\n".join(lines).rstrip() + "\n"
+    return buf.getvalue().rstrip() + "\n"
 
 
 def render_multi_project(data: dict, *, grades_summary: dict | None = None) -> str:
@@ -505,27 +666,33 @@ def render_multi_project(data: dict, *, grades_summary: dict | None = None) -> s
     course_code = _s(data.get("course_code")).strip()
     description = _norm_block(data.get("description"))
 
-    lines: list[str] = []
+    buf = io.StringIO()
+    buf.write(_H1)
     if course_code and course_name:
-        lines.append(f"# {course_code} - {course_name}")
+        buf.write(course_code)
+        buf.write(" - ")
+        buf.write(course_name)
     else:
-        lines.append(f"# {course_name or course_code or '课程'}")
+        buf.write(course_name or course_code or "课程")
+    buf.write("\n")
 
     if description:
-        lines.append("")
-        lines.append(description)
+        buf.write("\n")
+        buf.write(description)
+        buf.write("\n")
 
-    courses = [x for x in _as_list(data.get("courses")) if isinstance(x, dict)]
-    for c in courses:
+    for c in _iter_dicts(data.get("courses")):
         name = _s(c.get("name")).strip()
         code = _s(c.get("code")).strip()
         header = " - ".join([x for x in [code, name] if x]) or "课程"
 
-        lines.append("")
-        lines.append(f"## {header}")
+        buf.write("\n")
+        buf.write(_H2)
+        buf.write(header)
+        buf.write("\n")
 
         # Basic info badges (and strip the section from body)
-        sections = [x for x in _as_list(c.get("sections")) if isinstance(x, dict)]
+        sections = _iter_dicts(c.get("sections"))
 
         fallback_grading_badges: list[str] = []
         if grades_summary and code:
@@ -536,15 +703,16 @@ def render_multi_project(data: dict, *, grades_summary: dict | None = None) -> s
             sections, fallback_grading_badges=fallback_grading_badges
         )
         if basic_badges:
-            lines.append("")
-            lines.extend(basic_badges)
+            buf.write("\n")
+            _write_lines(buf, basic_badges)
 
-        teacher_lines = _render_teachers_with_reviews(c.get("teachers"))
-        if teacher_lines:
-            lines.append("")
-            lines.append(f"### {header} - 授课教师")
-            lines.append("")
-            lines.extend(teacher_lines)
+        teacher_text = _render_teachers_with_reviews(c.get("teachers"))
+        if teacher_text:
+            buf.write("\n")
+            buf.write(_H3)
+            buf.write(header)
+            buf.write(" - 授课教师\n\n")
+            buf.write(teacher_text)
 
         for sec in sections:
             stitle = _s(sec.get("title")).strip() or "章节"
@@ -552,20 +720,26 @@ def render_multi_project(data: dict, *, grades_summary: dict | None = None) -> s
             if not items:
                 continue
 
-            lines.append("")
-            lines.append(f"### {header} - {stitle}")
+            buf.write("\n")
+            buf.write(_H3)
+            buf.write(header)
+            buf.write(" - ")
+            buf.write(stitle)
+            buf.write("\n")
             for it in items:
                 content = it["content"]
                 author = it["author"]
                 if content:
-                    lines.append("")
-                    lines.append(content)
+                    buf.write("\n")
+                    buf.write(content)
+                    buf.write("\n")
                 aq = _render_author(author)
                 if aq:
-                    lines.append("")
-                    lines.append(aq)
+                    buf.write("\n")
+                    buf.write(aq)
+                    buf.write("\n")
 
-    return "\n".join(lines).rstrip() + "\n"
+    return buf.getvalue().rstrip() + "\n"
 
 
 def render_readme(data: dict, *, toml_path: Path) -> str:
@@ -584,10 +758,22 @@ def render_readme(data: dict, *, toml_path: Path) -> str:
     return _render_sections_schema(data, grades_summary=grades_summary)
 
 
+def _walk_readme_tomls(root: str | os.PathLike[str]) -> Iterator[Path]:
+    # One scandir per directory; DirEntry caches the type, so no extra stat per entry.
+    with os.scandir(root) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                yield from _walk_readme_tomls(e.path)
+            elif e.name == "readme.toml" and e.is_file():
+                yield Path(e.path)
+
+
 def _iter_readme_tomls(root: Path) -> list[Path]:
     if root.is_file():
         return [root]
-    return sorted(root.rglob("readme.toml"))
+    if not root.is_dir():
+        return []
+    return sorted(_walk_readme_tomls(root))
 
 
 def _default_out_path(input_path: Path) -> Path:
@@ -596,15 +782,72 @@ def _default_out_path(input_path: Path) -> Path:
     return input_path.with_name(f"{input_path.stem}_README.md")
 
 
+def _is_up_to_date(toml_path: Path, out: Path) -> bool:
+    """Whether out is newer than the TOML, grades summary and this converter."""
+
+    try:
+        out_mtime = out.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    sources = [toml_path, Path(__file__)]
+    grades_path = _grades_summary_path(toml_path)
+    if grades_path:
+        sources.append(grades_path)
+    return out_mtime > max(src.stat().st_mtime_ns for src in sources)
+
+
+def _existing_names(directory: Path) -> set[str]:
+    try:
+        with os.scandir(directory) as it:
+            return {e.name for e in it}
+    except FileNotFoundError:
+        return set()
+
+
+def _convert_one(toml_path: Path, out: Path, if_stale: bool = False) -> bool:
+    """Render one README; returns False if the --if-stale gate skipped it."""
+
+    if if_stale and _is_up_to_date(toml_path, out):
+        return False
+    data = _cached_toml_load(toml_path)
+    new_bytes = render_readme(data, toml_path=toml_path).encode("utf-8")
+    # Leave unchanged READMEs' contents alone, but when the gate sent us here bump
+    # the mtime so the next run sees them as up to date instead of re-rendering.
+    try:
+        if out.read_bytes() == new_bytes:
+            if if_stale:
+                os.utime(out)
+            return True
+    except FileNotFoundError:
+        pass
+    out.write_bytes(new_bytes)
+    return True
+
+
+def _init_worker(toml_cache_dir: Path | None) -> None:
+    global _TOML_CACHE_DIR
+    _TOML_CACHE_DIR = toml_cache_dir
+
+
 def main() -> int:
     p = argparse.ArgumentParser(description="Convert readme.toml to README.md (minimal).")
     g = p.add_mutually_exclusive_group(required=True)
     g.add_argument("--all", action="store_true", help="Convert ./final/**/readme.toml -> ./final/**/README.md")
     g.add_argument("--input", "-i", help="Input TOML file or a directory to scan")
     p.add_argument("--output", "-o", help="Output path (only valid when --input is a single file)")
-    p.add_argument("--overwrite", action="store_true", help="Overwrite existing README")
+    p.add_argument("--overwrite", "--force", action="store_true", help="Overwrite existing README")
+    p.add_argument(
+        "--if-stale", action="store_true", help="Overwrite existing README only if it is older than its sources"
+    )
+    p.add_argument("--jobs", "-j", type=int, default=None, help="Parallel workers for multi-file runs")
+    p.add_argument("--no-cache", action="store_true", help="Do not read or write the parsed-TOML disk cache")
     args = p.parse_args()
 
+    global _TOML_CACHE_DIR
+    if args.no_cache:
+        _TOML_CACHE_DIR = None
+    overwrite = args.overwrite or args.if_stale
+
     root = Path("final") if args.all else Path(args.input)
     toml_paths = _iter_readme_tomls(root)
     if not toml_paths:
@@ -613,13 +856,39 @@ def main() -> int:
     if args.output and len(toml_paths) != 1:
         raise ValueError("--output can only be used with a single input file")
 
-    for toml_path in toml_paths:
-        out = Path(args.output) if args.output else _default_out_path(toml_path)
-        if out.exists() and not args.overwrite:
-            continue
-        data = tomllib.loads(toml_path.read_text(encoding="utf-8"))
-        out.write_text(render_readme(data, toml_path=toml_path), encoding="utf-8", newline="\n")
+    targets = [(t, Path(args.output) if args.output else _default_out_path(t)) for t in toml_paths]
+    if not overwrite:
+        # One scandir per output directory instead of an exists() stat per README.
+        existing: dict[Path, set[str]] = {}
+        for _, out in targets:
+            if out.parent not in existing:
+                existing[out.parent] = _existing_names(out.parent)
+        targets = [(t, out) for t, out in targets if out.name not in existing[out.parent]]
+
+    cpus = os.cpu_count() or 1
+    if len(targets) > 4 and not args.output and (args.jobs or cpus) > 1:
+        # Each file is independent; small runs stay serial to avoid spawn overhead.
+        # pytomlpp parses outside the GIL and so does file I/O, so threads are enough
+        # there; pure-Python tomllib holds the GIL and needs processes instead.
+        ex: Executor
+        if _fast_toml is not None:
+            workers = args.jobs or min(32, cpus * 4)
+            ex = ThreadPoolExecutor(max_workers=workers)
+        else:
+            workers = args.jobs or cpus
+            ex = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(_TOML_CACHE_DIR,))
+        # Hand processes several files per round trip; threads ignore chunksize.
+        chunksize = max(1, len(targets) // (workers * 4))
+        with ex:
+            toml_list, out_list = zip(*targets)
+            done = sum(ex.map(_convert_one, toml_list, out_list, repeat(args.if_stale), chunksize=chunksize))
+    else:
+        done = sum(_convert_one(toml_path, out, args.if_stale) for toml_path, out in targets)
 
+    if args.if_stale:
+        print(f"--if-stale: skipped {len(targets) - done} up-to-date README(s), rendered {done}")
+    _pick_grade_string_cached.cache_clear()
+    _prune_toml_cache()
     return 0
 
 
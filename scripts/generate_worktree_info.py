@@ -4,6 +4,8 @@ import json
 import sys
 import os
 import logging
+from collections.abc import Iterator
+from contextlib import closing
 from pathlib import Path
 import re
 import hashlib
@@ -11,20 +13,28 @@ import hashlib
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_WORKTREE_PAT = re.compile(rb"<\|([a-z0-9]+)\|>")
 
-def cmd(cmds, cwd=None, allow_fail=False) -> bytes:
+
+def cmd(cmds, cwd=None, allow_fail=False, capture_stderr=False) -> bytes:
+    # stderr is only needed when something fails; read-only commands skip the pipe
+    # and are re-run once with it on failure. Commands with side effects should
+    # pass `capture_stderr=True` so they are never executed twice.
     try:
         logger.debug(f"run: {cmds}")
         result = subprocess.run(
             cmds,
             check=True,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
             text=False,
             cwd=cwd,
         )
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
+        if e.stderr is None:
+            rerun = subprocess.run(cmds, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd)
+            e.stderr = rerun.stderr
         logger.warning(f"Error executing git command: {cmds}")
         logger.warning(f"Error stdout: {e.stdout.strip()}")
         logger.warning(f"Error stderr: {e.stderr.strip()}")
@@ -37,6 +47,30 @@ def cmd(cmds, cwd=None, allow_fail=False) -> bytes:
             sys.exit(1)
 
 
+def iter_cmd_output(cmds, sep: bytes, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Run a command and yield its stdout split on `sep`, reading it in chunks."""
+    logger.debug(f"stream: {cmds}")
+    proc = subprocess.Popen(cmds, stdout=subprocess.PIPE)
+    try:
+        carry = b""
+        while chunk := proc.stdout.read(chunk_size):
+            *records, carry = (carry + chunk).split(sep)
+            yield from records
+        if carry:
+            yield carry
+    except GeneratorExit:
+        # consumer stopped early, no need to let the command finish
+        proc.kill()
+        raise
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        logger.warning(f"Error executing git command: {cmds}")
+        logger.warning(f"Error code: {returncode}")
+        sys.exit(1)
+
+
 def return_code(cmds) -> int:
     logger.debug(f"test: {cmds}")
     result = subprocess.run(
@@ -48,59 +82,53 @@ def return_code(cmds) -> int:
     return result.returncode
 
 
-def is_digit_in_ascii(c: int) -> bool:
-    return ord("0") <= c <= ord("9")
-
-
-def decode_git_ls_tree_path(content: bytes) -> str:
-    escaped_array = []
-
-    if content.startswith(b'"'):
-        if not content.endswith(b'"'):
-            raise RuntimeError(
-                f"Invalid git ls-tree output: path ill-quoted: `{content}`"
-            )
-        content = content[1:-1]
-
-    idx, end = 0, len(content)
-    while idx < end:
-        c = content[idx]
-        if c != ord(b"\\"):
-            escaped_array.append(c)
-            idx += 1
-            continue
-
-        # now c is '\', check escaping
-        idx += 1
-        if idx >= end:
-            raise RuntimeError(
-                f"Invalid git ls-tree output: path ill-escaped, ending with hangling backslash: `{content}`"
-            )
-        escaped_alpha = content[idx]
-        # check octal esaped character
-        if is_digit_in_ascii(escaped_alpha):
-            value_literal = content[idx : idx + 3]
-            if idx + 3 > end or not all(is_digit_in_ascii(c) for c in value_literal):
-                raise RuntimeError(
-                    f"Invalid git ls-tree output: path ill-escaped, wrong octal escape sequence: `{content}`"
-                )
-            value = int(value_literal, 8)
-            escaped_array.append(value)
-            idx += 3
-            continue
-        # check 'normal' C-liked escaped character
-        try:
-            value_bytes = eval(rf'b"\{chr(escaped_alpha)}"')
-            assert isinstance(value_bytes, bytes) and len(value_bytes) == 1
-        except SyntaxWarning or SyntaxError or AssertionError:
-            raise RuntimeError(
-                f"Invalid git ls-tree output: path ill-escaped, wrong escaped character: `{content}`"
-            )
-        escaped_array.append(ord(value_bytes))
-        idx += 1
-
-    assert idx == end
-    return bytes(escaped_array).decode("utf-8")
+def iter_head_log_changes() -> Iterator[tuple[str, int, list[str], list[set[str]]]]:
+    """Yield (commit-hash, commit-time, parents, changed-paths) for the history of HEAD.
+
+    Commits come children-first; changed-paths holds one set per reported parent.
+    """
+    log_cmd = [
+        "git",
+        "log",
+        "--topo-order",
+        "--name-only",
+        "-z",
+        "--no-renames",
+        "--diff-merges=separate",
+        "--format=%x01%H%x00%ct%x00%P",
+        "HEAD",
+    ]
+    with closing(iter_cmd_output(log_cmd, b"\0")) as tokens:
+        commit = None
+        for token in tokens:
+            if token.startswith(b"\x01"):
+                # 合并提交对每个父提交各输出一条记录（提交头重复）
+                commit_hash = token[1:].decode("ascii")
+                timestamp = int(next(tokens))
+                parents = next(tokens).decode("ascii").split()
+                if commit is None or commit[0] != commit_hash:
+                    if commit is not None:
+                        yield commit
+                    commit = (commit_hash, timestamp, parents, [])
+                commit[3].append(set())
+            elif token:
+                # the first path of each record follows a newline
+                commit[3][-1].add(token.removeprefix(b"\n").decode("utf-8"))
+        if commit is not None:
+            yield commit
+
+
+def align_merge_changes(
+    commit_hash: str, parents: list[str], changes: list[set[str]]
+) -> list[set[str]]:
+    # `git log -m` 不输出 diff 为空的父提交记录，按 tree 是否相同找出这些父提交
+    revs = [f"{c}^{{tree}}" for c in [commit_hash, *parents]]
+    trees = cmd(["git", "rev-parse", *revs]).split()
+    non_empty = [i for i, tree in enumerate(trees[1:]) if tree != trees[0]]
+    aligned: list[set[str]] = [set() for _ in parents]
+    for i, changed in zip(non_empty, changes):
+        aligned[i] = changed
+    return aligned
 
 
 def collect_info_for_head_commit() -> dict:
@@ -111,54 +139,65 @@ def collect_info_for_head_commit() -> dict:
     files_data: dict[str, dict] = {}
 
     # 获取文件列表和大小
-    ls_tree_output = cmd(
-        ["git", "ls-tree", "-r", "HEAD", "--format=%(objectsize)%x00%(path)"]
-    )
-    for line in ls_tree_output.splitlines():
-        size, path_raw = line.split(b"\0")
-        # print(path, len(path))
-        path = decode_git_ls_tree_path(path_raw)
-        # print(path_str, len(path_str))
-        files_data[path] = {"size": int(size)}
-
-    # 获取提交时间和哈希
-    files_path = list(files_data.keys())
-    for file_path in files_path:
-        time_hash = cmd(
-            ["git", "log", "-1", "--format=%cd%x00%H", "--date=unix", "--", file_path]
-        )
-        timestamp, commit_hash = time_hash.split(b"\0")
-
-        files_data[file_path]["time"] = int(timestamp)
-        files_data[file_path]["hash"] = commit_hash.decode("ascii")
+    # -z 下路径原样输出（--format 的 %(path) 仍会被转义），每条记录为
+    # `<mode> <type> <object> <size>\t<path>\0`
+    for record in iter_cmd_output(["git", "ls-tree", "-r", "-z", "-l", "HEAD"], b"\0"):
+        meta, path_raw = record.split(b"\t", 1)
+        size = meta.rsplit(None, 1)[-1]
+        files_data[path_raw.decode("utf-8")] = {"size": int(size)}
+
+    # 获取提交时间和哈希：只遍历一次历史，按 `git log -1 -- <path>` 的默认历史简化规则
+    # 逐个提交向下传递尚未确定的文件：普通提交修改了该文件即为结果；合并提交沿第一个
+    # 与之相同的父提交继续，与所有父提交都不同则该合并提交即为结果
+    head = cmd(["git", "rev-parse", "HEAD"]).decode("ascii")
+    pending: dict[str, set[str]] = {head: set(files_data)}
+    with closing(iter_head_log_changes()) as commits:
+        for commit_hash, timestamp, parents, changes in commits:
+            paths = pending.pop(commit_hash, None)
+            if not paths:
+                continue
+            if len(parents) > 1 and len(changes) != len(parents):
+                changes = align_merge_changes(commit_hash, parents, changes)
+            for path in paths:
+                for parent, changed in zip(parents, changes):
+                    if path not in changed:
+                        pending.setdefault(parent, set()).add(path)
+                        break
+                else:
+                    files_data[path]["time"] = timestamp
+                    files_data[path]["hash"] = commit_hash
+            if not pending:
+                break
 
     return files_data
 
 
 def prepare_or_checkout_to_worktree_branch(name: str):
     try:
-        cmd(["git", "checkout", name], allow_fail=True)
+        cmd(["git", "checkout", name], allow_fail=True, capture_stderr=True)
     except subprocess.CalledProcessError:
         logger.info(f"Creating new empty orphan worktree branch `{name}`")
-        cmd(["git", "checkout", "--orphan", name])
-        cmd(["git", "rm", "-rf", "."])
+        cmd(["git", "checkout", "--orphan", name], capture_stderr=True)
+        cmd(["git", "rm", "-rf", "."], capture_stderr=True)
     logger.info(f"Switched to worktree branch `{name}`")
 
 
 def prepare_user_info():
     logger.info("Setting user info")
-    cmd(["git", "config", "--local", "user.email", "action@github.com"])
-    cmd(["git", "config", "--local", "user.name", "GitHub Actions"])
+    cmd(["git", "config", "--local", "user.email", "action@github.com"], capture_stderr=True)
+    cmd(["git", "config", "--local", "user.name", "GitHub Actions"], capture_stderr=True)
 
 
-def save_json(path: str | Path, obj):
-    if isinstance(path, str):
-        path = Path(path)
+def save_json(obj, *paths: str | Path):
+    # serialize once, then write the same bytes to every destination
+    payload = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    for path in paths:
+        if isinstance(path, str):
+            path = Path(path)
 
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-    logger.info(f"Worktree info saved to `{path}`")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+        logger.info(f"Worktree info saved to `{path}`")
 
 
 def collect_info_and_saved_to_another_branch(worktree_branch_name: str):
@@ -166,20 +205,21 @@ def collect_info_and_saved_to_another_branch(worktree_branch_name: str):
     info = collect_info_for_head_commit()
 
     prepare_or_checkout_to_worktree_branch(worktree_branch_name)
-    save_json("worktree.json", info)
-    save_json(f"history/{info_commit_hash}.json", info)
+    save_json(info, "worktree.json", f"history/{info_commit_hash}.json")
 
     prepare_user_info()
-    cmd(["git", "add", "worktree.json", "history/"])
-    cmd(["git", "commit", "-m", f"update worktree info for <|{info_commit_hash}|>"])
-    cmd(["git", "push", "--set-upstream", "origin", worktree_branch_name])
+    cmd(["git", "add", "worktree.json", "history/"], capture_stderr=True)
+    cmd(
+        ["git", "commit", "-m", f"update worktree info for <|{info_commit_hash}|>"],
+        capture_stderr=True,
+    )
+    cmd(["git", "push", "--set-upstream", "origin", worktree_branch_name], capture_stderr=True)
     logger.info("Worktree info collected and saved to another branch")
 
 
 def get_last_worktree_info_target(
     worktree_branch_name: str, use_remote: bool = True
 ) -> str | None:
-    PAT = re.compile(rb"<\|([a-z0-9]+)\|>")
     try:
         branch_name = ("origin/" if use_remote else "") + worktree_branch_name
         commit_message = cmd(
@@ -191,13 +231,12 @@ def get_last_worktree_info_target(
         return None
 
     logger.info(f"Last commit message: `{commit_message}`")
-    match_result = PAT.findall(commit_message)
-    if len(match_result) != 1:
+    m = _WORKTREE_PAT.search(commit_message)
+    if m is None:
         logger.info("Last commit message does not contain worktree info target")
-        logger.debug(match_result)
         return None
     else:
-        hash = match_result[0].decode("ascii")
+        hash = m.group(1).decode("ascii")
         logger.info(f"matched last worktree info target: `{hash}`")
         return hash
 
@@ -223,7 +262,7 @@ def main():
 if __name__ == "__main__":
     logger.level = logging.DEBUG
     # print hash of script myself
-    logger.info(
-        f"Script hash: `{hashlib.sha256(open(__file__).read().encode('utf-8')).hexdigest()}`"
-    )
+    with open(__file__, "rb") as f:
+        script_hash = hashlib.file_digest(f, "sha256").hexdigest()
+    logger.info(f"Script hash: `{script_hash}`")
     main()
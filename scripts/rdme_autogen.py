@@ -18,6 +18,7 @@ Exit code:
 from __future__ import annotations
 
 import argparse
+import http.client
 import os
 import shutil
 import subprocess
@@ -25,6 +26,7 @@ import sys
 import tempfile
 import urllib.request
 from pathlib import Path
+from urllib.parse import urlsplit
 
 
 WARNING_START = "<!-- RDME_TOML_AUTOGEN_WARNING_START -->"
@@ -40,8 +42,8 @@ def _append_github_output(key: str, value: str) -> None:
     out = os.getenv("GITHUB_OUTPUT")
     if not out:
         return
-    Path(out).write_text("", encoding="utf-8") if not Path(out).exists() else None
-    with Path(out).open("a", encoding="utf-8", newline="\n") as f:
+    # append mode creates the file when it does not exist yet
+    with open(out, "a", encoding="utf-8", newline="\n") as f:
         f.write(f"{key}={value}\n")
 
 
@@ -49,8 +51,7 @@ def _normalize_newlines(text: str) -> str:
     return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
-def _build_block(message: str) -> str:
-    msg = (message or "").strip() or "TOML 自动化格式化/生成 README 失败，请检查 readme.toml。"
+def _block_for(msg: str) -> str:
     lines = [
         WARNING_START,
         "> [!WARNING]",
@@ -62,18 +63,27 @@ def _build_block(message: str) -> str:
     return "\n".join(lines)
 
 
+_DEFAULT_MSG = "TOML 自动化格式化/生成 README 失败，请检查 readme.toml。"
+_DEFAULT_BLOCK = _block_for(_DEFAULT_MSG)
+
+
+def _build_block(message: str) -> str:
+    msg = (message or "").strip()
+    if not msg or msg == _DEFAULT_MSG:
+        return _DEFAULT_BLOCK
+    return _block_for(msg)
+
+
 def _strip_block(text: str) -> str:
-    if WARNING_START not in text:
-        return text
     start = text.find(WARNING_START)
-    end = text.find(WARNING_END)
+    if start == -1:
+        return text
+    end = text.find(WARNING_END, start + len(WARNING_START))
     if end == -1:
         return text
     end = end + len(WARNING_END)
 
-    after = text[end:]
-    while after.startswith("\n"):
-        after = after[1:]
+    after = text[end:].lstrip("\n")
     before = text[:start]
     if before.endswith("\n"):
         before = before[:-1]
@@ -100,7 +110,35 @@ def _update_warning(readme_path: Path, *, set_warning: bool, message: str = "")
         readme_path.write_text(new_text, encoding="utf-8", newline="\n")
 
 
-def _download(url: str, dest: Path) -> None:
+def _download(url: str, dest: Path, conns: dict[str, http.client.HTTPSConnection]) -> None:
+    """Download url to dest, reusing one HTTPS connection per host across calls."""
+
+    parts = urlsplit(url)
+    # HTTPSConnection ignores https_proxy; proxied runners keep going through urllib.
+    if parts.scheme == "https" and "https" not in urllib.request.getproxies():
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        for attempt in range(2):
+            conn = conns.get(parts.netloc)
+            if conn is None:
+                conn = conns[parts.netloc] = http.client.HTTPSConnection(parts.netloc, timeout=30)
+            try:
+                conn.request("GET", path, headers={"User-Agent": "rdme-autogen"})
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                del conns[parts.netloc]
+                if attempt == 0 and isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError)):
+                    # the server closed the kept-alive connection; reconnect once
+                    continue
+                break
+            if resp.status == 200:
+                dest.write_bytes(body)
+                return
+            break
+
+    # Redirects, HTTP errors, connection failures and non-HTTPS or proxied URLs:
+    # let urllib handle (and raise) as before.
     req = urllib.request.Request(url, headers={"User-Agent": "rdme-autogen"})
     with urllib.request.urlopen(req, timeout=30) as resp:
         dest.write_bytes(resp.read())
@@ -148,18 +186,20 @@ def main() -> int:
 
     gen_ok = False
     gen_log = ""
+    # Both files normally live on raw.githubusercontent.com: share one TLS connection.
+    conns: dict[str, http.client.HTTPSConnection] = {}
     with tempfile.TemporaryDirectory(prefix="rdme-autogen-") as tmp:
         conv = Path(tmp) / "convert_toml_to_readme.py"
         grades = Path(tmp) / "grades_summary.toml"
         try:
-            _download(args.converter_url, conv)
+            _download(args.converter_url, conv, conns)
         except Exception as e:
             gen_ok = False
             gen_log = f"download converter failed: {e}"
         else:
             # Best-effort: download grades summary for badge rendering.
             try:
-                _download(GRADES_SUMMARY_URL, grades)
+                _download(GRADES_SUMMARY_URL, grades, conns)
             except Exception:
                 pass
 
@@ -168,6 +208,8 @@ def main() -> int:
                 [sys.executable, str(conv), "--input", str(toml_path.resolve()), "--overwrite"],
                 cwd=Path(tmp),
             )
+    for conn in conns.values():
+        conn.close()
 
     ok = fmt_ok and gen_ok
 